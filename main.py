@@ -5,9 +5,13 @@ This module serves as the entry point for the application and handles server sta
 All application logic is contained in the src package.
 """
 
-from src.app import app  # noqa: F401 - Required for uvicorn to find the app
 from src.config.loader import get_settings
 
+# Planner and uvicorn worker processes re-run this script as __mp_main__ before loading their
+# own code. Skipping the app there keeps them from creating it and opening the log file again
+if __name__ != "__mp_main__":
+    from src.app import app  # noqa: F401 - Required for uvicorn to find the app
+
 if __name__ == "__main__":
     import uvicorn
     import os
@@ -23,10 +27,16 @@ if __name__ == "__main__":
     print(f"Environment: {settings.environment}")
     print(f"Debug mode: {settings.debug}")
 
+    workers = settings.server.effective_workers
+    print(f"Workers: {workers}")
+
     uvicorn.run(
         "main:app",
         host=settings.server.host,
         port=settings.server.port,
         reload=settings.server.reload,
         log_level=settings.server.log_level,
+        workers=workers,
+        loop=settings.server.loop,
+        http=settings.server.http,
     )
@@ -0,0 +1,51 @@
+"""
+Rebuild the trajectories table so SQLite never reuses the ids of deleted trajectories.
+
+Tables created before `id` was declared AUTOINCREMENT let SQLite hand the highest deleted id
+to the next new trajectory. SQLite cannot add AUTOINCREMENT to an existing table, so this
+script copies the rows into a freshly created table and keeps their ids.
+
+Usage:
+    uv run python -m scripts.migrate_autoincrement
+"""
+
+from sqlalchemy import inspect, text
+from sqlmodel import Session, SQLModel
+
+from src.models.trajectory import Trajectory, get_engine, trajectory_list_index
+
+COLUMNS = "id, wall_width, wall_height, obstacles, path, obstacles_count, path_points"
+
+
+def migrate_autoincrement() -> bool:
+    """Rebuild the trajectories table with AUTOINCREMENT and return whether it was needed."""
+    engine = get_engine()
+    with Session(engine) as session:
+        table_sql = session.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'trajectories'")
+        ).scalar_one_or_none()
+        if table_sql is None or "AUTOINCREMENT" in table_sql.upper():
+            return False
+
+        # Index names are global in SQLite, so drop them before the new table recreates them
+        for index in inspect(session.connection()).get_indexes("trajectories"):
+            session.execute(text(f'DROP INDEX "{index["name"]}"'))
+        session.execute(text("ALTER TABLE trajectories RENAME TO trajectories_old"))
+
+        table = SQLModel.metadata.tables[Trajectory.__tablename__]
+        table.create(session.connection())
+        trajectory_list_index.create(session.connection(), checkfirst=True)
+        # Copying the ids also records the highest one in sqlite_sequence
+        session.execute(
+            text(f"INSERT INTO trajectories ({COLUMNS}) SELECT {COLUMNS} FROM trajectories_old")
+        )
+        session.execute(text("DROP TABLE trajectories_old"))
+        session.commit()
+        return True
+
+
+if __name__ == "__main__":
+    if migrate_autoincrement():
+        print("Rebuilt the trajectories table with AUTOINCREMENT ids")
+    else:
+        print("The trajectories table already uses AUTOINCREMENT ids")
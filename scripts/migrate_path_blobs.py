@@ -0,0 +1,36 @@
+"""
+Migrate stored trajectory paths from JSON text to the packed binary format.
+
+Trajectories created before paths were stored as packed int32 pairs keep their path as
+JSON text. They are still readable, but this script rewrites them so every row uses the
+same compact representation. It targets SQLite, whose dynamic typing lets both formats
+live in the same column.
+
+Usage:
+    uv run python -m scripts.migrate_path_blobs
+"""
+
+import numpy as np
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from src.models.trajectory import PATH_DTYPE, Trajectory, get_engine
+
+
+def migrate_path_blobs() -> int:
+    """Convert all JSON text paths to packed binary and return the number of rows changed."""
+    with Session(get_engine()) as session:
+        statement = select(Trajectory).where(func.typeof(Trajectory.path) == "text")
+        trajectories = session.exec(statement).all()
+
+        for trajectory in trajectories:
+            trajectory.path = np.asarray(trajectory.get_path(), dtype=PATH_DTYPE).tobytes()
+            session.add(trajectory)
+
+        session.commit()
+        return len(trajectories)
+
+
+if __name__ == "__main__":
+    migrated = migrate_path_blobs()
+    print(f"Migrated {migrated} trajectories to the binary path format")
@@ -1,10 +1,23 @@
 """Trajectory API routes for v1."""
 
+import asyncio
+import hashlib
 import time
-from fastapi import APIRouter, HTTPException, Depends, status
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Tuple, cast
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 from loguru import logger
 
+from src.config.loader import get_settings
 from src.models.trajectory import (
     TrajectoryRepository,
     get_session,
@@ -16,14 +29,163 @@ from src.schemas.trajectory import (
     TrajectoryListResponse,
     DeleteResponse,
     ErrorResponse,
-    ObstacleSchema,
+    PathFormat,
     TrajectoryListItem,
 )
-from src.services.path_planning import generate_trajectory
+from src.services.cache import LRUCache
+from src.services.path_planning import flatten_path, generate_trajectory, grid_dimensions
+from src.services.planner_pool import discard_planner_pool, get_planner_pool
 
 
 router = APIRouter(prefix="/trajectories", tags=["trajectories"])
 
+# Grid resolution used for every generated trajectory, in meters
+CELL_SIZE = 0.1
+
+# Approximate memory a cache entry holds besides its path: the response or plan objects, their
+# metadata and the cache's own bookkeeping. Counting it keeps entries with empty paths, such as
+# fully blocked walls, from being free to cache
+CACHE_ENTRY_BYTES = 1024
+CACHE_OBSTACLE_BYTES = 320
+
+
+def trajectory_cache_sizeof(response: TrajectoryGetResponse) -> int:
+    """Estimate the memory held by a cached GET response."""
+    path_bytes: int = response.path.nbytes
+    return CACHE_ENTRY_BYTES + len(response.obstacles) * CACHE_OBSTACLE_BYTES + path_bytes
+
+
+def plan_cache_sizeof(plan: Tuple[np.ndarray, Dict[str, Any]]) -> int:
+    """Estimate the memory held by a cached plan."""
+    return CACHE_ENTRY_BYTES + plan[0].nbytes
+
+
+# Stored trajectories never change, so GET responses are cached until the trajectory is deleted.
+# A delete only evicts the entry in the worker that handles it, so the cache is only enabled
+# when uvicorn runs a single worker
+trajectory_cache: LRUCache[int, TrajectoryGetResponse] = LRUCache(
+    get_settings().cache.trajectory_max_bytes
+    if get_settings().server.effective_workers == 1
+    else 0,
+    sizeof=trajectory_cache_sizeof,
+)
+
+# Path planning is deterministic, so identical requests reuse the previously generated plan
+plan_cache: LRUCache[bytes, Tuple[np.ndarray, Dict[str, Any]]] = LRUCache(
+    get_settings().cache.plan_max_bytes, sizeof=plan_cache_sizeof
+)
+
+# Paths with at least this many points are streamed instead of encoded into one response body
+STREAM_PATH_MIN_POINTS = 50_000
+
+# Path points encoded per streamed chunk (about 40 KB of JSON); each chunk is a threadpool hop
+STREAM_CHUNK_POINTS = 4096
+
+
+def plan_cache_key(request: TrajectoryCreateRequest, cell_size: float) -> bytes:
+    """Build a fixed-size cache key for the planner inputs, independent of obstacle order."""
+    obstacles = sorted(
+        (obs["x"], obs["y"], obs["width"], obs["height"]) for obs in request.obstacles
+    )
+    payload = orjson.dumps([request.wall_width, request.wall_height, cell_size, obstacles])
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def encode_path(content: Dict[str, Any], path_format: PathFormat) -> Dict[str, Any]:
+    """Re-encode a dumped trajectory response's path in the requested format."""
+    if path_format == "flat":
+        rows, cols = grid_dimensions(content["wall_width"], content["wall_height"], CELL_SIZE)
+        content["path"] = flatten_path(content["path"], cols)
+        # Clients need the column count to decode the flat indices
+        content["metadata"] = {
+            **(content["metadata"] or {}),
+            "grid_dimensions": {"rows": rows, "cols": cols},
+        }
+    return content
+
+
+async def run_planner(
+    plan: Callable[[], Tuple[np.ndarray, Dict[str, Any]]],
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Run a planner call in the process pool, or in a thread when the pool is disabled."""
+    planner_pool = get_planner_pool()
+    if planner_pool is None:
+        return await run_in_threadpool(plan)
+
+    # Planning is CPU-bound, so run it in a worker process instead of a GIL-bound thread
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(planner_pool, plan)
+    except BrokenProcessPool:
+        # A planner process died (e.g. killed for running out of memory), which breaks the
+        # whole pool; replace it so this and later requests do not keep failing
+        logger.warning("Planner pool is broken, restarting it")
+        discard_planner_pool(planner_pool)
+    return await loop.run_in_executor(get_planner_pool(), plan)
+
+
+def iter_path_json(content: Dict[str, Any]) -> Iterator[bytes]:
+    """Yield a dumped trajectory response as JSON, encoding its path a chunk at a time."""
+    keys = list(content)
+    split = keys.index("path")
+    path = content["path"]
+    head = orjson.dumps(
+        {key: content[key] for key in keys[:split]}, option=orjson.OPT_SERIALIZE_NUMPY
+    )
+    tail = orjson.dumps(
+        {key: content[key] for key in keys[split + 1 :]}, option=orjson.OPT_SERIALIZE_NUMPY
+    )
+
+    # Splice the path between the members around it, so the key order matches ORJSONResponse
+    yield head[:-1] + (b',"path":[' if split else b'"path":[')
+    for start in range(0, len(path), STREAM_CHUNK_POINTS):
+        chunk = orjson.dumps(
+            path[start : start + STREAM_CHUNK_POINTS], option=orjson.OPT_SERIALIZE_NUMPY
+        )
+        # Drop the chunk's own brackets so the pieces join into a single array
+        yield (b"," if start else b"") + chunk[1:-1]
+    yield (b"]," if len(tail) > 2 else b"]") + tail[1:]
+
+
+def path_response(content: Dict[str, Any], status_code: int = status.HTTP_200_OK) -> Response:
+    """Return a dumped trajectory response, streaming it when the path is very large."""
+    if len(content["path"]) < STREAM_PATH_MIN_POINTS:
+        # ORJSONResponse serializes the NumPy path directly, without converting it to lists
+        return ORJSONResponse(content=content, status_code=status_code)
+    # A sync iterator makes Starlette encode each chunk in the threadpool, off the event loop
+    return StreamingResponse(
+        iter_path_json(content), status_code=status_code, media_type="application/json"
+    )
+
+
+async def parse_create_request(request: Request) -> TrajectoryCreateRequest:
+    """Validate the creation payload straight from the raw JSON body."""
+    body = await request.body()
+    if not body:
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+        )
+    try:
+        return TrajectoryCreateRequest.model_validate_json(body)
+    except ValidationError as e:
+        # Report errors the same way FastAPI does for bodies it parses itself
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+
+def request_body_schema(model: type[BaseModel]) -> Dict[str, Any]:
+    """Build the OpenAPI request body for a route that reads and validates its body itself."""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    # Nested models are already published as components by the response models
+    schema.pop("$defs", None)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
+
 
 @router.post(
     "",
@@ -31,6 +193,7 @@ router = APIRouter(prefix="/trajectories", tags=["trajectories"])
     status_code=status.HTTP_201_CREATED,
     summary="Create a new trajectory",
     description="Generate and store a new trajectory for wall finishing with obstacles",
+    openapi_extra=request_body_schema(TrajectoryCreateRequest),
     responses={
         201: {"description": "Trajectory created successfully"},
         400: {"model": ErrorResponse, "description": "Invalid input parameters"},
@@ -38,27 +201,47 @@ router = APIRouter(prefix="/trajectories", tags=["trajectories"])
     },
 )
 async def create_trajectory(
-    request: TrajectoryCreateRequest, session: Session = Depends(get_session)
-) -> TrajectoryCreateResponse:
+    request: TrajectoryCreateRequest = Depends(parse_create_request),
+    path_format: PathFormat = Query(
+        default="pairs",
+        description="Path encoding: [row, col] pairs, or flat `row * cols + col` cell indices",
+    ),
+    session: Session = Depends(get_session),
+) -> Response:
     """Create a new trajectory with wall dimensions and obstacles."""
-    start_time = time.perf_counter()
+    start_ns = time.perf_counter_ns()
 
     try:
         logger.info(
-            f"[Trajectory Creation] Wall: {request.wall_width}x{request.wall_height}m, "
-            f"Obstacles: {len(request.obstacles)} | Data: {request.obstacles}"
+            "[Trajectory Creation] Wall: {}x{}m, Obstacles: {} | Data: {}",
+            request.wall_width,
+            request.wall_height,
+            len(request.obstacles),
+            request.obstacles,
         )
 
-        # Convert Pydantic obstacles to dict format
-        obstacles_dict = [obs.model_dump() for obs in request.obstacles]
-
-        # Generate trajectory using path planning service
-        path, metadata = generate_trajectory(
-            wall_width=request.wall_width,
-            wall_height=request.wall_height,
-            obstacles=obstacles_dict,
-            cell_size=0.1,  # Fixed value
-        )
+        # Obstacles are validated straight into plain dicts, the format the planner expects
+        obstacles_dict = cast(List[Dict[str, float]], request.obstacles)
+
+        cache_key = plan_cache_key(request, CELL_SIZE)
+        cached_plan = plan_cache.get(cache_key)
+        if cached_plan is not None:
+            logger.debug("Reusing cached plan for identical trajectory request")
+            path, metadata = cached_plan
+        else:
+            plan = partial(
+                generate_trajectory,
+                wall_width=request.wall_width,
+                wall_height=request.wall_height,
+                obstacles=obstacles_dict,
+                cell_size=CELL_SIZE,
+                # TrajectoryCreateRequest already enforced the wall and obstacle bounds
+                validate=False,
+            )
+            path, metadata = await run_planner(plan)
+            # Cached plans are shared between requests, so nothing may modify the path in place
+            path.flags.writeable = False
+            plan_cache.set(cache_key, (path, metadata))
 
         # Store in database
         trajectory_data = {
@@ -68,34 +251,39 @@ async def create_trajectory(
             "path": path,
         }
 
-        trajectory = TrajectoryRepository.create_trajectory(session, trajectory_data)
+        trajectory = await run_in_threadpool(
+            TrajectoryRepository.create_trajectory, session, trajectory_data
+        )
 
         # Ensure trajectory was created with an ID
         assert trajectory.id is not None, "Trajectory ID should not be None after creation"
 
-        execution_time = time.perf_counter() - start_time
+        execution_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
-        response = TrajectoryCreateResponse(
+        # Everything in the response was just validated or computed here, so skip re-validation
+        response = TrajectoryCreateResponse.model_construct(
             id=trajectory.id,
             wall_width=trajectory.wall_width,
             wall_height=trajectory.wall_height,
-            obstacles=[ObstacleSchema(**obs) for obs in obstacles_dict],
+            obstacles=request.obstacles,
             path=path,
             metadata=metadata,
-            execution_time=execution_time,
+            execution_time=execution_ms / 1000,
         )
 
         logger.info(
-            f"[Trajectory Created] ID: {trajectory.id} | Time taken: {execution_time:.4f} seconds"
+            "[Trajectory Created] ID: {} | Time taken: {:.3f} ms", trajectory.id, execution_ms
         )
 
-        return response
+        return path_response(
+            encode_path(response.model_dump(), path_format), status.HTTP_201_CREATED
+        )
 
     except ValueError as e:
-        logger.warning(f"Invalid input for trajectory creation: {str(e)}")
+        logger.warning("Invalid input for trajectory creation: {}", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error creating trajectory: {str(e)}")
+        logger.error("Error creating trajectory: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -111,17 +299,31 @@ async def create_trajectory(
     },
 )
 async def get_trajectory(
-    trajectory_id: int, session: Session = Depends(get_session)
-) -> TrajectoryGetResponse:
+    trajectory_id: int,
+    path_format: PathFormat = Query(
+        default="pairs",
+        description="Path encoding: [row, col] pairs, or flat `row * cols + col` cell indices",
+    ),
+    session: Session = Depends(get_session),
+) -> Response:
     """Get trajectory by ID."""
-    start_time = time.perf_counter()
+    start_ns = time.perf_counter_ns()
 
     try:
-        logger.debug(f"Retrieving trajectory {trajectory_id}")
+        logger.debug("Retrieving trajectory {}", trajectory_id)
+
+        cached_response = trajectory_cache.get(trajectory_id)
+        if cached_response is not None:
+            logger.debug("Served trajectory {} from cache", trajectory_id)
+            return path_response(encode_path(cached_response.model_dump(), path_format))
 
-        trajectory = TrajectoryRepository.get_trajectory(session, trajectory_id)
+        # A DELETE that lands while the row is being read must keep it out of the cache
+        cache_generation = trajectory_cache.generation
+        trajectory = await run_in_threadpool(
+            TrajectoryRepository.get_trajectory, session, trajectory_id
+        )
         if not trajectory:
-            logger.warning(f"Trajectory {trajectory_id} not found")
+            logger.warning("Trajectory {} not found", trajectory_id)
             raise HTTPException(status_code=404, detail="Trajectory not found")
 
         # Ensure trajectory has an ID (should always be true from database)
@@ -131,23 +333,25 @@ async def get_trajectory(
         obstacles = trajectory.get_obstacles()
         path = trajectory.get_path()
 
-        response = TrajectoryGetResponse(
+        # Stored data was validated when the trajectory was created, so skip re-validation
+        response = TrajectoryGetResponse.model_construct(
             id=trajectory.id,
             wall_width=trajectory.wall_width,
             wall_height=trajectory.wall_height,
-            obstacles=[ObstacleSchema(**obs) for obs in obstacles],
+            obstacles=obstacles,
             path=path,
         )
+        trajectory_cache.set(trajectory_id, response, generation=cache_generation)
 
-        execution_time = time.perf_counter() - start_time
-        logger.debug(f"Retrieved trajectory {trajectory_id} in {execution_time:.3f} seconds")
+        execution_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        logger.debug("Retrieved trajectory {} in {:.3f} ms", trajectory_id, execution_ms)
 
-        return response
+        return path_response(encode_path(response.model_dump(), path_format))
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving trajectory {trajectory_id}: {str(e)}")
+        logger.error("Error retrieving trajectory {}: {}", trajectory_id, e)
         raise HTTPException(status_code=500, detail="Failed to retrieve trajectory")
 
 
@@ -165,12 +369,16 @@ async def list_trajectories(
     skip: int = 0, limit: int = 100, session: Session = Depends(get_session)
 ) -> TrajectoryListResponse:
     """List all trajectories with pagination."""
-    start_time = time.perf_counter()
+    start_ns = time.perf_counter_ns()
 
     try:
-        logger.debug(f"Listing trajectories with skip={skip}, limit={limit}")
+        logger.debug("Listing trajectories with skip={}, limit={}", skip, limit)
 
-        trajectories = TrajectoryRepository.get_all_trajectories(session, skip, limit)
+        trajectories = await run_in_threadpool(
+            TrajectoryRepository.get_all_trajectories, session, skip, limit
+        )
+        # Sessions are not thread-safe, so the count runs after the page query, not alongside it
+        total = await run_in_threadpool(TrajectoryRepository.get_total_count, session)
         trajectory_items = [
             TrajectoryListItem(
                 id=trajectory["id"],
@@ -182,17 +390,15 @@ async def list_trajectories(
             for trajectory in trajectories
         ]
 
-        response = TrajectoryListResponse(
-            trajectories=trajectory_items, total=len(trajectory_items)
-        )
+        response = TrajectoryListResponse(trajectories=trajectory_items, total=total)
 
-        execution_time = time.perf_counter() - start_time
-        logger.debug(f"Listed {len(trajectory_items)} trajectories in {execution_time:.3f} seconds")
+        execution_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        logger.debug("Listed {} trajectories in {:.3f} ms", len(trajectory_items), execution_ms)
 
         return response
 
     except Exception as e:
-        logger.error(f"Error listing trajectories: {str(e)}")
+        logger.error("Error listing trajectories: {}", e)
         raise HTTPException(status_code=500, detail="Failed to list trajectories")
 
 
@@ -211,27 +417,30 @@ async def delete_trajectory(
     trajectory_id: int, session: Session = Depends(get_session)
 ) -> DeleteResponse:
     """Delete trajectory by ID."""
-    start_time = time.perf_counter()
+    start_ns = time.perf_counter_ns()
 
     try:
-        logger.info(f"Deleting trajectory {trajectory_id}")
+        logger.info("Deleting trajectory {}", trajectory_id)
 
-        success = TrajectoryRepository.delete_trajectory(session, trajectory_id)
+        success = await run_in_threadpool(
+            TrajectoryRepository.delete_trajectory, session, trajectory_id
+        )
+        trajectory_cache.pop(trajectory_id)
         if not success:
-            logger.warning(f"Trajectory {trajectory_id} not found for deletion")
+            logger.warning("Trajectory {} not found for deletion", trajectory_id)
             raise HTTPException(status_code=404, detail="Trajectory not found")
 
         response = DeleteResponse(
             message="Trajectory deleted successfully", deleted_id=trajectory_id
         )
 
-        execution_time = time.perf_counter() - start_time
-        logger.info(f"Deleted trajectory {trajectory_id} in {execution_time:.3f} seconds")
+        execution_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        logger.info("Deleted trajectory {} in {:.3f} ms", trajectory_id, execution_ms)
 
         return response
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting trajectory {trajectory_id}: {str(e)}")
+        logger.error("Error deleting trajectory {}: {}", trajectory_id, e)
         raise HTTPException(status_code=500, detail="Failed to delete trajectory")
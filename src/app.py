@@ -7,19 +7,32 @@ from typing import AsyncGenerator, Any
 from fastapi import FastAPI, status, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.responses import Response
 from loguru import logger
 
 from src.config.loader import get_settings
 from src.config.schemas import Settings
 from src.models.trajectory import create_db_and_tables
+from src.services.planner_pool import shutdown_planner_pool, start_planner_pool
 from src.api.v1.router import router as v1_router
 
 
+# Handler ids added by configure_logging, so reconfiguring replaces only our own handlers
+_log_handler_ids: list[int] = []
+
+
 def configure_logging(settings: Settings) -> None:
-    """Configure Loguru logging based on settings."""
-    # Remove default handler
-    logger.remove()
+    """Configure Loguru logging based on settings (safe to call repeatedly)."""
+    if _log_handler_ids:
+        # Already configured: drop the handlers we added previously
+        for handler_id in _log_handler_ids:
+            logger.remove(handler_id)
+        _log_handler_ids.clear()
+    else:
+        # Remove default handler
+        logger.remove()
 
     # Create logs directory if it doesn't exist
     log_dir = os.path.dirname(settings.logging.file_path)
@@ -27,24 +40,41 @@ def configure_logging(settings: Settings) -> None:
         os.makedirs(log_dir, exist_ok=True)
 
     # Add file handler
-    logger.add(
-        settings.logging.file_path,
-        rotation=settings.logging.rotation,
-        retention=settings.logging.retention,
-        level=settings.logging.level,
-        format=settings.logging.format,
+    _log_handler_ids.append(
+        logger.add(
+            settings.logging.file_path,
+            rotation=settings.logging.rotation,
+            retention=settings.logging.retention,
+            level=settings.logging.level,
+            format=settings.logging.format,
+        )
     )
 
     # Add console handler for development
     if settings.debug:
-        logger.add(
-            lambda msg: print(msg, end=""),
-            level=settings.logging.level,
-            format=settings.logging.format,
-            colorize=True,
+        _log_handler_ids.append(
+            logger.add(
+                lambda msg: print(msg, end=""),
+                level=settings.logging.level,
+                format=settings.logging.format,
+                colorize=True,
+            )
         )
 
 
+class CachedStaticFiles(StaticFiles):
+    """Static file app that lets clients cache assets and revalidate them via ETag."""
+
+    def __init__(self, *, max_age: int, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.max_age = max_age
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", f"public, max-age={self.max_age}")
+        return response
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     # Load settings
@@ -59,9 +89,11 @@ def create_app() -> FastAPI:
         # Startup
         logger.info("Starting Wall Finishing Robot API")
         create_db_and_tables()
+        start_planner_pool()
         yield
         # Shutdown
         logger.info("Shutting down Wall Finishing Robot API")
+        shutdown_planner_pool()
 
     # Create FastAPI application
     app = FastAPI(
@@ -71,6 +103,8 @@ def create_app() -> FastAPI:
         docs_url=settings.api.docs_url,
         redoc_url=settings.api.redoc_url,
         lifespan=lifespan,
+        # Trajectory paths run to thousands of points, so serialize responses with orjson
+        default_response_class=ORJSONResponse,
     )
 
     # Add CORS middleware
@@ -82,21 +116,32 @@ def create_app() -> FastAPI:
         allow_headers=settings.cors.allow_headers,
     )
 
+    # Compress larger responses such as trajectory paths and frontend assets
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.server.gzip_minimum_size,
+        compresslevel=settings.server.gzip_compresslevel,
+    )
+
     # Mount static files for frontend
-    app.mount("/static", StaticFiles(directory="src/static"), name="static")
+    app.mount(
+        "/static",
+        CachedStaticFiles(directory="src/static", max_age=settings.server.static_max_age),
+        name="static",
+    )
 
     # Exception handlers
     @app.exception_handler(ValueError)
-    async def value_error_exception_handler(request: Request, exc: ValueError) -> JSONResponse:
+    async def value_error_exception_handler(request: Request, exc: ValueError) -> ORJSONResponse:
         """Handle ValueError exceptions with proper logging."""
         logger.error(f"ValueError in {request.url.path}: {str(exc)}")
-        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+        return ORJSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
 
     @app.exception_handler(Exception)
-    async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+    async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
         """Handle general exceptions with proper logging."""
         logger.error(f"Unexpected error in {request.url.path}: {str(exc)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "Internal server error"},
         )
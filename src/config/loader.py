@@ -1,6 +1,8 @@
 """Configuration loader for the wall finishing robot application."""
 
+import copy
 import tomllib
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -33,14 +35,19 @@ class ConfigLoader:
     def merge_configs(
         self, base_config: Dict[str, Any], override_config: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Merge two configuration dictionaries recursively."""
-        result = base_config.copy()
-
-        for key, value in override_config.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self.merge_configs(result[key], value)
-            else:
-                result[key] = value
+        """Merge two configuration dictionaries, recursing into nested tables."""
+        # Copy the base once, then merge the overrides into that copy in place
+        result = copy.deepcopy(base_config)
+        pending = [(result, override_config)]
+
+        while pending:
+            target, overrides = pending.pop()
+            for key, value in overrides.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    pending.append((current, value))
+                else:
+                    target[key] = value
 
         return result
 
@@ -62,6 +69,7 @@ class ConfigLoader:
 config_loader = ConfigLoader()
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the application settings."""
+    """Get the application settings, parsed once per process."""
     return config_loader.load_settings()
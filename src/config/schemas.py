@@ -1,5 +1,7 @@
 """Configuration schemas for the wall finishing robot application."""
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -9,6 +11,13 @@ class DatabaseConfig(BaseModel):
 
     url: str = Field(default="sqlite:///./trajectories.db", description="Database URL")
     echo: bool = Field(default=False, description="Enable SQLAlchemy echo logging")
+    pool_size: int = Field(default=20, description="Connection pool size (non-SQLite only)")
+    max_overflow: int = Field(
+        default=10, description="Connections allowed beyond pool_size (non-SQLite only)"
+    )
+    pool_timeout: int = Field(
+        default=30, description="Seconds to wait for a pooled connection (non-SQLite only)"
+    )
 
 
 class LoggingConfig(BaseModel):
@@ -36,6 +45,26 @@ class ServerConfig(BaseModel):
     port: int = Field(default=8000, description="Server port")
     reload: bool = Field(default=True, description="Enable auto-reload in development")
     log_level: str = Field(default="info", description="Uvicorn log level")
+    workers: int = Field(
+        default=1, ge=1, description="Number of worker processes (always 1 with reload)"
+    )
+    loop: str = Field(default="auto", description="Uvicorn event loop (auto, uvloop, asyncio)")
+    http: str = Field(default="auto", description="Uvicorn HTTP protocol (auto, httptools, h11)")
+    gzip_minimum_size: int = Field(
+        default=1024, description="Smallest response size in bytes that gets gzip-compressed"
+    )
+    gzip_compresslevel: int = Field(
+        default=5, ge=1, le=9, description="Gzip compression level (1 = fastest, 9 = smallest)"
+    )
+    static_max_age: int = Field(
+        default=3600, description="Seconds clients may cache static frontend assets"
+    )
+
+    @property
+    def effective_workers(self) -> int:
+        """Number of worker processes uvicorn actually starts."""
+        # The reloader only supports a single worker process
+        return 1 if self.reload else self.workers
 
 
 class CORSConfig(BaseModel):
@@ -47,6 +76,34 @@ class CORSConfig(BaseModel):
     allow_headers: list[str] = Field(default=["*"], description="Allowed headers")
 
 
+class CacheConfig(BaseModel):
+    """In-process cache configuration settings."""
+
+    trajectory_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Approximate bytes kept in the GET cache (0 disables it; off with several workers)",
+    )
+    plan_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Approximate bytes of generated plans reused for identical requests (0 disables)",
+    )
+
+
+class PlannerConfig(BaseModel):
+    """Path planning execution settings."""
+
+    max_workers: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description=(
+            "Planner processes per API worker (defaults to the CPU count divided by the "
+            "number of workers; 0 plans in the API process)"
+        ),
+    )
+
+
 class APIConfig(BaseModel):
     """API configuration settings."""
 
@@ -73,6 +130,8 @@ class Settings(BaseSettings):
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     server: ServerConfig = Field(default_factory=ServerConfig)
     cors: CORSConfig = Field(default_factory=CORSConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    planner: PlannerConfig = Field(default_factory=PlannerConfig)
     api: APIConfig = Field(default_factory=APIConfig)
 
     model_config = SettingsConfigDict(
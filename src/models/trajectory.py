@@ -1,12 +1,35 @@
 """Database models for trajectory storage using SQLModel."""
 
-from typing import Optional, List, Dict, Any, Generator
-from sqlmodel import SQLModel, Field, create_engine, Session, select
-from sqlalchemy import Engine
-import json
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Generator, Union
+from sqlmodel import SQLModel, Field, col, create_engine, Session, select
+from sqlalchemy import Engine, Index, delete, event, func, literal
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import numpy as np
+import orjson
 from loguru import logger
 from src.config.loader import get_settings
 
+# Path points are stored as packed (row, col) pairs of this dtype
+PATH_DTYPE = np.int32
+
+# Applied to every new SQLite connection: WAL lets reads run alongside writes, and the
+# larger page cache and memory map keep hot pages out of the filesystem
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+# Each failed attempt means another process created one of the schema objects first, so a few
+# attempts cover every table and index
+SCHEMA_CREATE_ATTEMPTS = 5
+
 
 class TrajectoryBase(SQLModel):
     """Base model for trajectory with common fields."""
@@ -14,7 +37,7 @@ class TrajectoryBase(SQLModel):
     wall_width: float = Field(..., description="Width of the wall in meters")
     wall_height: float = Field(..., description="Height of the wall in meters")
     obstacles: str = Field(..., description="JSON string of obstacles list")
-    path: str = Field(..., description="JSON string of trajectory path")
+    path: bytes = Field(..., description="Trajectory path packed as int32 (row, col) pairs")
     obstacles_count: int = Field(..., description="Number of obstacles")
     path_points: int = Field(..., description="Number of points in trajectory path")
 
@@ -23,6 +46,8 @@ class Trajectory(TrajectoryBase, table=True):
     """Database model for storing robot trajectories."""
 
     __tablename__ = "trajectories"
+    # Never hand a deleted trajectory's id to a new one, so stale references cannot see it
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
 
@@ -35,14 +60,14 @@ class Trajectory(TrajectoryBase, table=True):
         wall_width: float,
         wall_height: float,
         obstacles: List[Dict[str, float]],
-        path: List[List[int]],
+        path: Union[np.ndarray, List[List[int]]],
     ) -> "Trajectory":
-        """Create a trajectory instance with JSON serialization."""
+        """Create a trajectory instance, serializing obstacles to JSON and packing the path."""
         return cls(
             wall_width=wall_width,
             wall_height=wall_height,
-            obstacles=json.dumps(obstacles),
-            path=json.dumps(path),
+            obstacles=orjson.dumps(obstacles).decode(),
+            path=np.asarray(path, dtype=PATH_DTYPE).tobytes(),
             obstacles_count=len(obstacles),
             path_points=len(path),
         )
@@ -50,47 +75,113 @@ class Trajectory(TrajectoryBase, table=True):
     def get_obstacles(self) -> List[Dict[str, float]]:
         """Parse obstacles from JSON string."""
         try:
-            obstacles: List[Dict[str, float]] = json.loads(self.obstacles)
+            obstacles: List[Dict[str, float]] = orjson.loads(self.obstacles)
             return obstacles
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse obstacles JSON for trajectory {self.id}")
+        except orjson.JSONDecodeError:
+            logger.error("Failed to parse obstacles JSON for trajectory {}", self.id)
             return []
 
-    def get_path(self) -> List[List[int]]:
-        """Parse path from JSON string."""
+    def get_path(self) -> np.ndarray:
+        """Unpack path from its binary representation into an (N, 2) array."""
+        if isinstance(self.path, str):
+            # Rows written before the binary format stored the path as JSON text
+            try:
+                return np.asarray(orjson.loads(self.path), dtype=PATH_DTYPE).reshape(-1, 2)
+            except (orjson.JSONDecodeError, ValueError):
+                logger.error("Failed to parse path JSON for trajectory {}", self.id)
+                return np.empty((0, 2), dtype=PATH_DTYPE)
+
         try:
-            path: List[List[int]] = json.loads(self.path)
-            return path
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse path JSON for trajectory {self.id}")
-            return []
+            return np.frombuffer(self.path, dtype=PATH_DTYPE).reshape(-1, 2)
+        except ValueError:
+            logger.error("Failed to unpack path for trajectory {}", self.id)
+            return np.empty((0, 2), dtype=PATH_DTYPE)
+
+
+# Covers the columns projected by the list endpoint, so listing never touches the wide rows
+trajectory_list_index = Index(
+    "ix_trajectories_list",
+    col(Trajectory.id),
+    col(Trajectory.wall_width),
+    col(Trajectory.wall_height),
+    col(Trajectory.obstacles_count),
+    col(Trajectory.path_points),
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Tune a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
 
+@lru_cache(maxsize=1)
 def get_engine() -> Engine:
-    """Get database engine with current settings."""
-    settings = get_settings()
-    return create_engine(settings.database.url, echo=settings.database.echo)
+    """Get the process-wide database engine, configured with a pool suited to the backend."""
+    database = get_settings().database
+    url = database.url
 
+    if url.startswith("sqlite"):
+        # SQLite connections are handed between FastAPI worker threads
+        connect_args = {"check_same_thread": False}
+        if ":memory:" in url or url.rstrip("/") == "sqlite:":
+            # An in-memory database only exists for its connection, so share a single one
+            engine = create_engine(
+                url, echo=database.echo, connect_args=connect_args, poolclass=StaticPool
+            )
+        else:
+            engine = create_engine(url, echo=database.echo, connect_args=connect_args)
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_engine(
+        url,
+        echo=database.echo,
+        pool_size=database.pool_size,
+        max_overflow=database.max_overflow,
+        pool_timeout=database.pool_timeout,
+        pool_pre_ping=True,
+    )
 
-engine = get_engine()
+
+@lru_cache(maxsize=1)
+def get_session_factory() -> sessionmaker[Session]:
+    """Get the session factory bound to the database engine."""
+    # Keep attributes loaded after commit so handlers can read them without another SELECT
+    return sessionmaker(bind=get_engine(), class_=Session, expire_on_commit=False)
 
 
 def create_db_and_tables() -> None:
-    """Create database and tables."""
+    """Create database and tables (safe to run from several worker processes at once)."""
     try:
-        SQLModel.metadata.create_all(engine)
+        engine = get_engine()
+        for attempt in range(1, SCHEMA_CREATE_ATTEMPTS + 1):
+            try:
+                SQLModel.metadata.create_all(engine)
 
-        # Create index on id for efficient retrieval (primary key already indexed)
-        # But let's ensure we have the table created
+                # create_all skips tables that already exist, so add the list index to older
+                # databases
+                trajectory_list_index.create(engine, checkfirst=True)
+                break
+            except OperationalError as e:
+                # Existence checks and CREATE statements are separate, so a worker starting at
+                # the same time can create an object in between; the retry sees and skips it
+                if attempt == SCHEMA_CREATE_ATTEMPTS:
+                    raise
+                logger.debug("Schema creation raced with another process, retrying: {}", e)
         logger.info("Database and tables created successfully")
     except Exception as e:
-        logger.error(f"Error creating database: {e}")
+        logger.error("Error creating database: {}", e)
         raise
 
 
 def get_session() -> Generator[Session, None, None]:
     """Get database session."""
-    with Session(engine) as session:
+    with get_session_factory()() as session:
         yield session
 
 
@@ -109,8 +200,8 @@ class TrajectoryRepository:
         )
 
         session.add(trajectory)
+        # The primary key is populated on flush, so there is no need to refresh after commit
         session.commit()
-        session.refresh(trajectory)
 
         return trajectory
 
@@ -119,9 +210,9 @@ class TrajectoryRepository:
         """Get trajectory by ID."""
         trajectory = session.get(Trajectory, trajectory_id)
         if trajectory:
-            logger.debug(f"Retrieved trajectory {trajectory_id}")
+            logger.debug("Retrieved trajectory {}", trajectory_id)
         else:
-            logger.warning(f"Trajectory {trajectory_id} not found")
+            logger.warning("Trajectory {} not found", trajectory_id)
         return trajectory
 
     @staticmethod
@@ -141,7 +232,7 @@ class TrajectoryRepository:
             .limit(limit)
         )
         trajectories = session.exec(statement).all()
-        logger.debug(f"Retrieved {len(trajectories)} trajectories")
+        logger.debug("Retrieved {} trajectories", len(trajectories))
         return [
             {
                 "id": traj[0],
@@ -153,21 +244,28 @@ class TrajectoryRepository:
             for traj in trajectories
         ]
 
+    @staticmethod
+    def get_total_count(session: Session) -> int:
+        """Get the total number of stored trajectories."""
+        total: int = session.exec(select(func.count(Trajectory.id))).one()  # type: ignore[arg-type]
+        return total
+
     @staticmethod
     def delete_trajectory(session: Session, trajectory_id: int) -> bool:
         """Delete trajectory by ID."""
-        trajectory = session.get(Trajectory, trajectory_id)
-        if trajectory:
-            session.delete(trajectory)
-            session.commit()
-            logger.info(f"Deleted trajectory {trajectory_id}")
+        # Single DELETE statement, without loading the row (and its path blob) first
+        result = session.execute(delete(Trajectory).where(col(Trajectory.id) == trajectory_id))
+        session.commit()
+        if result.rowcount:  # type: ignore[attr-defined]
+            logger.info("Deleted trajectory {}", trajectory_id)
             return True
         else:
-            logger.warning(f"Trajectory {trajectory_id} not found for deletion")
+            logger.warning("Trajectory {} not found for deletion", trajectory_id)
             return False
 
     @staticmethod
     def trajectory_exists(session: Session, trajectory_id: int) -> bool:
         """Check if trajectory exists."""
-        trajectory = session.get(Trajectory, trajectory_id)
-        return trajectory is not None
+        # Only probes the primary key index instead of fetching the whole row
+        statement = select(literal(1)).where(col(Trajectory.id) == trajectory_id).limit(1)
+        return session.exec(statement).first() is not None
@@ -1,20 +1,57 @@
 """Pydantic schemas for trajectory API validation and responses."""
 
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, model_validator, ConfigDict
+from typing import Annotated, List, Dict, Any, Literal, Optional
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    Field,
+    PlainSerializer,
+    WithJsonSchema,
+    model_validator,
+    ConfigDict,
+    with_config,
+)
+from typing_extensions import TypedDict
+
+# Path coordinates as a NumPy array: (N, 2) [row, col] pairs, or (N,) flat cell indices when
+# requested with path_format=flat. It is kept as-is (no per-element validation) so
+# ORJSONResponse can serialize it natively; Pydantic's own JSON mode falls back to lists.
+PathArray = Annotated[
+    Any,
+    PlainSerializer(lambda path: np.asarray(path).tolist(), when_used="json"),
+    WithJsonSchema(
+        {
+            "anyOf": [
+                {
+                    "type": "array",
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "minItems": 2,
+                        "maxItems": 2,
+                    },
+                },
+                {"type": "array", "items": {"type": "integer"}},
+            ]
+        }
+    ),
+]
 
+# Encoding of the path in trajectory responses
+PathFormat = Literal["pairs", "flat"]
 
-class ObstacleSchema(BaseModel):
-    """Schema for obstacle validation."""
 
-    x: float = Field(..., ge=0, description="X coordinate in meters (must be >= 0)")
-    y: float = Field(..., ge=0, description="Y coordinate in meters (must be >= 0)")
-    width: float = Field(..., gt=0, description="Width in meters (must be > 0)")
-    height: float = Field(..., gt=0, description="Height in meters (must be > 0)")
+@with_config(
+    ConfigDict(json_schema_extra={"example": {"x": 1.0, "y": 1.0, "width": 0.25, "height": 0.25}})
+)
+class ObstacleSchema(TypedDict):
+    """Schema for obstacle validation, validated into a plain dict."""
 
-    model_config = ConfigDict(
-        json_schema_extra={"example": {"x": 1.0, "y": 1.0, "width": 0.25, "height": 0.25}}
-    )
+    x: Annotated[float, Field(ge=0, description="X coordinate in meters (must be >= 0)")]
+    y: Annotated[float, Field(ge=0, description="Y coordinate in meters (must be >= 0)")]
+    width: Annotated[float, Field(gt=0, description="Width in meters (must be > 0)")]
+    height: Annotated[float, Field(gt=0, description="Height in meters (must be > 0)")]
 
 
 class TrajectoryCreateRequest(BaseModel):
@@ -29,21 +66,31 @@ class TrajectoryCreateRequest(BaseModel):
     @model_validator(mode="after")
     def validate_obstacles_within_wall(self) -> "TrajectoryCreateRequest":
         """Validate that all obstacles fit within the wall boundaries."""
-        for i, obstacle in enumerate(self.obstacles):
-            # Check if obstacle fits within wall
-            if obstacle.x + obstacle.width > self.wall_width:
-                raise ValueError(
-                    f"Obstacle {i + 1} extends beyond wall width: "
-                    f"x({obstacle.x}) + width({obstacle.width}) = {obstacle.x + obstacle.width} > {self.wall_width}"
-                )
-
-            if obstacle.y + obstacle.height > self.wall_height:
-                raise ValueError(
-                    f"Obstacle {i + 1} extends beyond wall height: "
-                    f"y({obstacle.y}) + height({obstacle.height}) = {obstacle.y + obstacle.height} > {self.wall_height}"
-                )
-
-        return self
+        if not self.obstacles:
+            return self
+
+        bounds = np.asarray(
+            [(obs["x"], obs["y"], obs["width"], obs["height"]) for obs in self.obstacles],
+            dtype=np.float64,
+        )
+        beyond_width = bounds[:, 0] + bounds[:, 2] > self.wall_width
+        beyond_height = bounds[:, 1] + bounds[:, 3] > self.wall_height
+        outside = beyond_width | beyond_height
+        if not outside.any():
+            return self
+
+        # Report the first offending obstacle, checking width before height
+        i = int(np.argmax(outside))
+        obstacle = self.obstacles[i]
+        if beyond_width[i]:
+            raise ValueError(
+                f"Obstacle {i + 1} extends beyond wall width: "
+                f"x({obstacle['x']}) + width({obstacle['width']}) = {obstacle['x'] + obstacle['width']} > {self.wall_width}"
+            )
+        raise ValueError(
+            f"Obstacle {i + 1} extends beyond wall height: "
+            f"y({obstacle['y']}) + height({obstacle['height']}) = {obstacle['y'] + obstacle['height']} > {self.wall_height}"
+        )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -67,12 +114,19 @@ class TrajectoryGetResponse(BaseModel):
     wall_width: float = Field(..., description="Width of the wall in meters")
     wall_height: float = Field(..., description="Height of the wall in meters")
     obstacles: List[ObstacleSchema] = Field(..., description="List of obstacles")
-    path: List[List[int]] = Field(..., description="Trajectory path as [row, col] coordinates")
+    path: PathArray = Field(
+        ...,
+        description=(
+            "Trajectory path as [row, col] coordinates, or as flat `row * cols + col` cell "
+            "indices with path_format=flat"
+        ),
+    )
     metadata: Optional[Dict[str, Any]] = Field(
         default=None, description="Additional trajectory metadata"
     )
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "id": 1,
@@ -88,7 +142,7 @@ class TrajectoryGetResponse(BaseModel):
                     "coverage_percentage": 99.9,
                 },
             }
-        }
+        },
     )
 
 
@@ -99,13 +153,20 @@ class TrajectoryCreateResponse(BaseModel):
     wall_width: float = Field(..., description="Width of the wall in meters")
     wall_height: float = Field(..., description="Height of the wall in meters")
     obstacles: List[ObstacleSchema] = Field(..., description="List of obstacles")
-    path: List[List[int]] = Field(..., description="Trajectory path as [row, col] coordinates")
+    path: PathArray = Field(
+        ...,
+        description=(
+            "Trajectory path as [row, col] coordinates, or as flat `row * cols + col` cell "
+            "indices with path_format=flat"
+        ),
+    )
     metadata: Dict[str, Any] = Field(..., description="Trajectory generation metadata")
     execution_time: float = Field(
         ..., description="Time taken to generate the trajectory in seconds"
     )
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "id": 1,
@@ -124,7 +185,7 @@ class TrajectoryCreateResponse(BaseModel):
                 },
                 "execution_time": 0.123,
             }
-        }
+        },
     )
 
 
@@ -138,6 +199,7 @@ class TrajectoryListItem(BaseModel):
     path_points: int = Field(..., description="Number of points in trajectory path")
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "id": 1,
@@ -146,7 +208,7 @@ class TrajectoryListItem(BaseModel):
                 "obstacle_count": 3,
                 "path_points": 2473,
             }
-        }
+        },
     )
 
 
@@ -154,9 +216,10 @@ class TrajectoryListResponse(BaseModel):
     """Schema for trajectory list response."""
 
     trajectories: List[TrajectoryListItem] = Field(..., description="List of trajectory metadata")
-    total: int = Field(..., description="Total number of trajectories")
+    total: int = Field(..., description="Total number of stored trajectories, across all pages")
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "trajectories": [
@@ -170,7 +233,7 @@ class TrajectoryListResponse(BaseModel):
                 ],
                 "total": 1,
             }
-        }
+        },
     )
 
 
@@ -179,7 +242,9 @@ class ErrorResponse(BaseModel):
 
     detail: str = Field(..., description="Error message")
 
-    model_config = ConfigDict(json_schema_extra={"example": {"detail": "Trajectory not found"}})
+    model_config = ConfigDict(
+        frozen=True, json_schema_extra={"example": {"detail": "Trajectory not found"}}
+    )
 
 
 class DeleteResponse(BaseModel):
@@ -189,7 +254,8 @@ class DeleteResponse(BaseModel):
     deleted_id: int = Field(..., description="ID of deleted trajectory")
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {"message": "Trajectory deleted successfully", "deleted_id": 1}
-        }
+        },
     )
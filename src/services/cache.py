@@ -0,0 +1,89 @@
+"""In-process caching helpers."""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe mapping bounded to `maxsize`, evicting the least recently used entries.
+
+    Without `sizeof`, `maxsize` is a number of entries. With it, `maxsize` bounds the sum of
+    `sizeof(value)` over all entries, e.g. their size in bytes.
+    """
+
+    def __init__(self, maxsize: int, sizeof: Optional[Callable[[V], int]] = None):
+        if maxsize < 0:
+            raise ValueError("Cache size must be non-negative")
+        self.maxsize = maxsize
+        self._sizeof = sizeof
+        self._data: OrderedDict[K, Tuple[V, int]] = OrderedDict()
+        self._size = 0
+        self._generation = 0
+        self._lock = Lock()
+
+    @property
+    def size(self) -> int:
+        """Current total size of the cached entries."""
+        return self._size
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every `pop` and `clear`, to detect invalidations during a lookup."""
+        return self._generation
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for `key`, or None on a miss."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        """
+        Store `value` under `key`, evicting the oldest entries until the cache fits.
+
+        When `generation` is given, the value is only stored if no entry was invalidated since
+        that generation was read, since the value may have been loaded before the invalidation.
+        """
+        # Every entry counts, or zero-size values could grow the cache without bound
+        size = max(self._sizeof(value), 1) if self._sizeof is not None else 1
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._discard(key)
+            # Values larger than the whole cache would only evict everything else
+            if size > self.maxsize:
+                return
+            self._data[key] = (value, size)
+            self._size += size
+            while self._size > self.maxsize:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._size -= evicted_size
+
+    def pop(self, key: K) -> None:
+        """Remove `key` from the cache if present."""
+        with self._lock:
+            self._discard(key)
+            self._generation += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+            self._generation += 1
+
+    def _discard(self, key: K) -> None:
+        # Callers hold the lock
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+    def __len__(self) -> int:
+        return len(self._data)
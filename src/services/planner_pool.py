@@ -0,0 +1,107 @@
+"""Process pool that runs path planning outside the API process."""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import lru_cache
+from typing import Optional
+
+from loguru import logger
+
+from src.config.loader import get_settings
+from src.config.schemas import Settings
+from src.services.path_planning import warm_up_planner
+
+
+def planner_pool_size() -> int:
+    """Number of planner processes; 0 means planning runs in the API process."""
+    settings = get_settings()
+    if settings.planner.max_workers is None:
+        # Every uvicorn worker gets its own pool, so they share the CPUs between them
+        return (os.cpu_count() or 1) // settings.server.effective_workers
+    return settings.planner.max_workers
+
+
+def planner_start_method() -> str:
+    """Multiprocessing start method for planner processes."""
+    # forkserver keeps workers from inheriting the state of the threaded API process. Windows
+    # has no forkserver, and spawn isolates workers the same way
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def init_planner_process(settings: Settings) -> None:
+    """Route a planner process's logs like the API process's, then warm up the path kernel."""
+    # Planner processes never import the app, so replace loguru's DEBUG-to-stderr default
+    logger.remove()
+    # The API process owns rotation and retention; watch reopens the file after it rotates
+    logger.add(
+        settings.logging.file_path,
+        level=settings.logging.level,
+        format=settings.logging.format,
+        watch=True,
+    )
+    if settings.debug:
+        logger.add(
+            sys.stdout,
+            level=settings.logging.level,
+            format=settings.logging.format,
+            colorize=True,
+        )
+    warm_up_planner()
+
+
+@lru_cache(maxsize=1)
+def get_planner_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the process-wide planner pool, or None when planning should stay in-process.
+
+    Worker processes are started on demand; each sets up logging and compiles the path kernel
+    as it starts.
+    """
+    max_workers = planner_pool_size()
+    if max_workers == 0:
+        return None
+
+    start_method = planner_start_method()
+    logger.info("Starting path planning pool with up to {} {} processes", max_workers, start_method)
+    mp_context = multiprocessing.get_context(start_method)
+    if start_method == "forkserver":
+        # Workers fork from a server that has only imported the planner, not the API's __main__
+        mp_context.set_forkserver_preload(["src.services.path_planning"])
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=init_planner_process,
+        initargs=(get_settings(),),
+    )
+
+
+def start_planner_pool() -> None:
+    """Start every planner process up front, so no request waits for a worker to boot."""
+    pool = get_planner_pool()
+    if pool is None:
+        warm_up_planner()
+        return
+
+    # The pool spawns a process per queued task until it is full; each one runs the warm-up
+    wait([pool.submit(int) for _ in range(planner_pool_size())])
+
+
+def discard_planner_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool, so the next get_planner_pool call starts a fresh one."""
+    # Concurrent requests may all report the same broken pool; only replace it once
+    if get_planner_pool.cache_info().currsize and get_planner_pool() is pool:
+        get_planner_pool.cache_clear()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_planner_pool() -> None:
+    """Stop the planner pool's worker processes, if it was started."""
+    if get_planner_pool.cache_info().currsize:
+        pool = get_planner_pool()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        get_planner_pool.cache_clear()
@@ -1,25 +1,59 @@
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
 from src.app import app
+from src.api.v1.trajectories import plan_cache, trajectory_cache
 from src.models.trajectory import get_session
+from src.services.planner_pool import shutdown_planner_pool, start_planner_pool
 import pytest
 from fastapi.testclient import TestClient
 
 
+@pytest.fixture(scope="session", autouse=True)
+def planner_pool():
+    """Boot the planner processes once, as the application lifespan does."""
+    start_planner_pool()
+    yield
+    shutdown_planner_pool()
+
+
 # Create test database
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create a test database session."""
-    # Mock in-memory sqlite database
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture():
+    """Create the in-memory test database once for the whole test run."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+
+    # pysqlite's implicit transactions break SAVEPOINT, so let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_transaction(connection):
+        connection.exec_driver_sql("BEGIN")
+
     SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    """Create a test database session whose changes are rolled back after the test."""
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        # Commits in the code under test release savepoints inside the outer transaction.
+        # Match the application's session factory, which keeps attributes loaded after commit
+        with Session(
+            bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
+        transaction.rollback()
 
 
 @pytest.fixture(name="client")
@@ -33,3 +67,6 @@ def client_fixture(session: Session):
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
+    # Each test's rows are rolled back and their IDs reused, so cached entries must not leak
+    trajectory_cache.clear()
+    plan_cache.clear()
@@ -1,8 +1,20 @@
 """Comprehensive tests for Wall Finishing Robot API endpoints."""
 
+import os
+from concurrent.futures.process import BrokenProcessPool
+
 import pytest
-import time
 from fastapi.testclient import TestClient
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, select
+
+from src.api.v1 import trajectories as trajectories_api
+from src.models import trajectory as trajectory_models
+from src.models.trajectory import Trajectory, TrajectoryRepository
+from src.schemas.trajectory import TrajectoryCreateRequest
+from src.services.planner_pool import get_planner_pool, start_planner_pool
 
 
 # Trajectory creation tests
@@ -18,13 +30,7 @@ def test_create_valid_trajectory(client: TestClient):
         ],
     }
 
-    start_time = time.perf_counter()
     response = client.post("/api/v1/trajectories", json=payload)
-    end_time = time.perf_counter()
-
-    # Check response time (should be < 1s)
-    response_time = end_time - start_time
-    assert response_time < 1.0, f"Response time {response_time:.3f}s exceeds 1s limit"
 
     assert response.status_code == 201
     data = response.json()
@@ -75,6 +81,99 @@ def test_create_trajectory_single_obstacle(client: TestClient):
     assert data["metadata"]["obstacle_cells"] == 121
 
 
+def test_identical_requests_reuse_plan(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    """Test that identical requests reuse the cached plan regardless of obstacle order."""
+    obstacles = [
+        {"x": 1.0, "y": 1.0, "width": 0.5, "height": 0.5},
+        {"x": 2.0, "y": 0.5, "width": 0.25, "height": 1.0},
+    ]
+    payload = {"wall_width": 3.0, "wall_height": 3.0, "obstacles": obstacles}
+    first_response = client.post("/api/v1/trajectories", json=payload)
+    assert first_response.status_code == 201
+
+    def fail_plan(**kwargs: object) -> None:
+        raise AssertionError("Identical request must not be planned again")
+
+    monkeypatch.setattr(trajectories_api, "generate_trajectory", fail_plan)
+
+    payload["obstacles"] = obstacles[::-1]
+    second_response = client.post("/api/v1/trajectories", json=payload)
+    assert second_response.status_code == 201
+
+    first, second = first_response.json(), second_response.json()
+    assert second["id"] != first["id"]
+    assert second["path"] == first["path"]
+    assert second["metadata"] == first["metadata"]
+
+
+def test_in_process_planning_matches_pool(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    """Test that disabling the planner pool produces the same trajectory."""
+    payload = {
+        "wall_width": 2.0,
+        "wall_height": 1.5,
+        "obstacles": [{"x": 0.5, "y": 0.5, "width": 0.3, "height": 0.2}],
+    }
+    pool_response = client.post("/api/v1/trajectories", json=payload)
+    assert pool_response.status_code == 201
+
+    trajectories_api.plan_cache.clear()
+    monkeypatch.setattr(trajectories_api, "get_planner_pool", lambda: None)
+    local_response = client.post("/api/v1/trajectories", json=payload)
+    assert local_response.status_code == 201
+
+    assert local_response.json()["path"] == pool_response.json()["path"]
+    assert local_response.json()["metadata"] == pool_response.json()["metadata"]
+
+
+def test_broken_planner_pool_is_replaced(client: TestClient):
+    """Test that a planner process dying does not fail every later request."""
+    pool = get_planner_pool()
+    if pool is None:
+        pytest.skip("the planner pool is disabled")
+    # Kill a worker the way the OOM killer would, which breaks the whole pool
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()
+
+    payload = {"wall_width": 1.2, "wall_height": 0.8, "obstacles": []}
+    response = client.post("/api/v1/trajectories", json=payload)
+
+    assert response.status_code == 201
+    assert len(response.json()["path"]) == 96
+    assert get_planner_pool() is not pool
+    # Boot the replacement pool so later tests do not wait for its workers
+    start_planner_pool()
+
+
+def test_empty_plans_count_against_the_cache_budget(client: TestClient):
+    """Test that fully blocked walls, whose paths are empty, still take up cache space."""
+    payload = {
+        "wall_width": 1.0,
+        "wall_height": 1.0,
+        "obstacles": [{"x": 0.0, "y": 0.0, "width": 1.0, "height": 1.0}],
+    }
+    response = client.post("/api/v1/trajectories", json=payload)
+    assert response.status_code == 201
+    assert response.json()["path"] == []
+
+    assert trajectories_api.plan_cache.size >= trajectories_api.CACHE_ENTRY_BYTES
+
+
+def test_cached_plans_are_read_only(client: TestClient):
+    """Test that cached paths cannot be modified by later requests."""
+    payload = {"wall_width": 1.0, "wall_height": 1.0, "obstacles": []}
+    assert client.post("/api/v1/trajectories", json=payload).status_code == 201
+
+    cache_key = trajectories_api.plan_cache_key(
+        TrajectoryCreateRequest(**payload), trajectories_api.CELL_SIZE
+    )
+    cached_plan = trajectories_api.plan_cache.get(cache_key)
+    assert cached_plan is not None
+
+    path, _ = cached_plan
+    with pytest.raises(ValueError):
+        path[0, 0] = 99
+
+
 def test_invalid_wall_dimensions(client: TestClient):
     """Test validation of wall dimensions."""
     # Negative width
@@ -88,6 +187,14 @@ def test_invalid_wall_dimensions(client: TestClient):
     assert response.status_code == 422
 
 
+def test_wall_exceeding_grid_limit(client: TestClient):
+    """Test that walls too large for the path's int16 cell indices are rejected."""
+    payload = {"wall_width": 4000.0, "wall_height": 0.1, "obstacles": []}
+    response = client.post("/api/v1/trajectories", json=payload)
+    assert response.status_code == 400
+    assert "maximum grid size" in response.json()["detail"]
+
+
 def test_obstacles_outside_wall(client: TestClient):
     """Test validation of obstacles outside wall boundaries."""
     payload = {
@@ -103,6 +210,47 @@ def test_obstacles_outside_wall(client: TestClient):
     assert "extends beyond wall width" in response.json()["detail"][0]["msg"]
 
 
+def test_create_trajectory_invalid_body(client: TestClient):
+    """Test that malformed and missing request bodies are rejected."""
+    response = client.post(
+        "/api/v1/trajectories", content=b"not json", headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+    response = client.post("/api/v1/trajectories")
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body"]
+
+
+def test_create_trajectory_request_body_documented(client: TestClient):
+    """Test that the self-parsed request body is still described in the OpenAPI schema."""
+    operation = client.get("/openapi.json").json()["paths"]["/api/v1/trajectories"]["post"]
+    schema = operation["requestBody"]["content"]["application/json"]["schema"]
+
+    assert set(schema["required"]) == {"wall_width", "wall_height"}
+    assert schema["properties"]["obstacles"]["items"]["$ref"] == (
+        "#/components/schemas/ObstacleSchema"
+    )
+
+
+def test_first_obstacle_outside_wall_is_reported(client: TestClient):
+    """Test that the first obstacle outside the wall is the one reported."""
+    payload = {
+        "wall_width": 5.0,
+        "wall_height": 5.0,
+        "obstacles": [
+            {"x": 1.0, "y": 1.0, "width": 0.5, "height": 0.5},
+            {"x": 1.0, "y": 4.5, "width": 0.5, "height": 1.0},  # Extends beyond wall height
+            {"x": 4.5, "y": 1.0, "width": 1.0, "height": 0.5},  # Extends beyond wall width
+        ],
+    }
+
+    response = client.post("/api/v1/trajectories", json=payload)
+    assert response.status_code == 422
+    assert "Obstacle 2 extends beyond wall height" in response.json()["detail"][0]["msg"]
+
+
 def test_invalid_obstacle_dimensions(client: TestClient):
     """Test validation of obstacle dimensions."""
     # Negative obstacle width
@@ -139,13 +287,7 @@ def test_get_existing_trajectory(client: TestClient):
     trajectory_id = create_response.json()["id"]
 
     # Now retrieve it
-    start_time = time.perf_counter()
     response = client.get(f"/api/v1/trajectories/{trajectory_id}")
-    end_time = time.perf_counter()
-
-    # Check response time
-    response_time = end_time - start_time
-    assert response_time < 1.0, f"Response time {response_time:.3f}s exceeds 1s limit"
 
     assert response.status_code == 200
     data = response.json()
@@ -157,6 +299,123 @@ def test_get_existing_trajectory(client: TestClient):
     assert isinstance(data["path"], list)
 
 
+def test_create_trajectory_issues_no_select(session: Session):
+    """Test that storing a trajectory does not read the row back from the database."""
+    statements: list[str] = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        trajectory = TrajectoryRepository.create_trajectory(
+            session,
+            {"wall_width": 0.2, "wall_height": 0.2, "obstacles": [], "path": [[0, 0], [0, 1]]},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert trajectory.id is not None
+    assert trajectory.get_path().tolist() == [[0, 0], [0, 1]]
+    assert not [statement for statement in statements if statement.lstrip().startswith("SELECT")]
+
+
+def test_flat_path_format(client: TestClient):
+    """Test that paths can be requested as flat row * cols + col cell indices."""
+    payload = {
+        "wall_width": 1.0,
+        "wall_height": 0.5,
+        "obstacles": [{"x": 0.2, "y": 0.1, "width": 0.2, "height": 0.2}],
+    }
+    pairs_response = client.post("/api/v1/trajectories", json=payload)
+    flat_response = client.post("/api/v1/trajectories?path_format=flat", json=payload)
+    assert flat_response.status_code == 201
+
+    pairs, flat = pairs_response.json(), flat_response.json()
+    cols = flat["metadata"]["grid_dimensions"]["cols"]
+    assert cols == 10
+    assert [list(divmod(index, cols)) for index in flat["path"]] == pairs["path"]
+
+    get_response = client.get(f"/api/v1/trajectories/{pairs['id']}?path_format=flat")
+    assert get_response.status_code == 200
+    assert get_response.json()["path"] == flat["path"]
+    assert get_response.json()["metadata"]["grid_dimensions"] == {"rows": 5, "cols": 10}
+
+    # The default format is unaffected by earlier flat requests
+    assert client.get(f"/api/v1/trajectories/{pairs['id']}").json()["path"] == pairs["path"]
+
+
+def test_invalid_path_format(client: TestClient):
+    """Test that unknown path formats are rejected."""
+    payload = {"wall_width": 1.0, "wall_height": 1.0, "obstacles": []}
+    response = client.post("/api/v1/trajectories?path_format=csv", json=payload)
+    assert response.status_code == 422
+
+
+def test_large_paths_are_streamed(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    """Test that paths above the streaming threshold produce the same JSON in chunks."""
+    payload = {
+        "wall_width": 10.0,
+        "wall_height": 5.0,
+        "obstacles": [{"x": 1.0, "y": 0.5, "width": 0.5, "height": 0.5}],
+    }
+    expected = client.post("/api/v1/trajectories", json=payload).json()
+    assert len(expected["path"]) > trajectories_api.STREAM_CHUNK_POINTS
+    flat_expected = client.get(f"/api/v1/trajectories/{expected['id']}?path_format=flat").json()
+
+    monkeypatch.setattr(trajectories_api, "STREAM_PATH_MIN_POINTS", 1)
+
+    response = client.post("/api/v1/trajectories", json=payload)
+    assert response.status_code == 201
+    assert "content-length" not in response.headers
+    data = response.json()
+    # Streamed responses keep the same shape, key order included
+    assert list(data) == list(expected)
+    assert data["path"] == expected["path"]
+    assert data["metadata"] == expected["metadata"]
+
+    flat_response = client.get(f"/api/v1/trajectories/{data['id']}?path_format=flat")
+    assert flat_response.status_code == 200
+    assert list(flat_response.json()) == list(flat_expected)
+    assert flat_response.json() == {**flat_expected, "id": data["id"]}
+
+
+def test_get_legacy_json_path_trajectory(client: TestClient, session: Session):
+    """Test retrieving a trajectory whose path was stored as JSON text."""
+    session.execute(
+        text(
+            "INSERT INTO trajectories "
+            "(wall_width, wall_height, obstacles, path, obstacles_count, path_points) "
+            "VALUES (0.2, 0.2, '[]', '[[0, 0], [0, 1], [1, 1], [1, 0]]', 0, 4)"
+        )
+    )
+    session.commit()
+    trajectory_id = session.exec(select(Trajectory.id)).one()
+
+    response = client.get(f"/api/v1/trajectories/{trajectory_id}")
+    assert response.status_code == 200
+    assert response.json()["path"] == [[0, 0], [0, 1], [1, 1], [1, 0]]
+
+
+def test_get_trajectory_served_from_cache(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    """Test that repeated retrievals are served from the cache without a database read."""
+    payload = {"wall_width": 1.0, "wall_height": 1.0, "obstacles": []}
+    trajectory_id = client.post("/api/v1/trajectories", json=payload).json()["id"]
+
+    first_response = client.get(f"/api/v1/trajectories/{trajectory_id}")
+    assert first_response.status_code == 200
+
+    def fail_read(session: Session, trajectory_id: int) -> None:
+        raise AssertionError("Cached trajectory must not be read from the database")
+
+    monkeypatch.setattr(TrajectoryRepository, "get_trajectory", fail_read)
+
+    second_response = client.get(f"/api/v1/trajectories/{trajectory_id}")
+    assert second_response.status_code == 200
+    assert second_response.json() == first_response.json()
+
+
 def test_get_nonexistent_trajectory(client: TestClient):
     """Test retrieving a non-existent trajectory."""
     response = client.get("/api/v1/trajectories/99999")
@@ -200,13 +459,7 @@ def test_list_multiple_trajectories(client: TestClient):
         created_ids.append(response.json()["id"])
 
     # List all trajectories
-    start_time = time.perf_counter()
     response = client.get("/api/v1/trajectories")
-    end_time = time.perf_counter()
-
-    # Check response time
-    response_time = end_time - start_time
-    assert response_time < 1.0, f"Response time {response_time:.3f}s exceeds 1s limit"
 
     assert response.status_code == 200
     data = response.json()
@@ -224,6 +477,47 @@ def test_list_multiple_trajectories(client: TestClient):
         assert traj["id"] in created_ids
 
 
+def test_list_trajectories_pagination_total(client: TestClient):
+    """Test that the list total counts all trajectories, not just the current page."""
+    for _ in range(3):
+        response = client.post(
+            "/api/v1/trajectories", json={"wall_width": 1.0, "wall_height": 1.0, "obstacles": []}
+        )
+        assert response.status_code == 201
+
+    response = client.get("/api/v1/trajectories", params={"skip": 1, "limit": 1})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert len(data["trajectories"]) == 1
+    assert data["total"] == 3
+
+
+def test_list_trajectories_uses_stored_counts(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    """Test listing reads the count columns instead of parsing obstacles and paths."""
+    payload = {
+        "wall_width": 2.0,
+        "wall_height": 2.0,
+        "obstacles": [{"x": 0.5, "y": 0.5, "width": 0.5, "height": 0.5}],
+    }
+    create_response = client.post("/api/v1/trajectories", json=payload)
+    assert create_response.status_code == 201
+    path_points = create_response.json()["metadata"]["path_points"]
+
+    def fail_parse(self: Trajectory) -> None:
+        raise AssertionError("Listing must not parse trajectory obstacles or paths")
+
+    monkeypatch.setattr(Trajectory, "get_obstacles", fail_parse)
+    monkeypatch.setattr(Trajectory, "get_path", fail_parse)
+
+    response = client.get("/api/v1/trajectories")
+    assert response.status_code == 200
+
+    item = response.json()["trajectories"][0]
+    assert item["obstacle_count"] == 1
+    assert item["path_points"] == path_points
+
+
 # Trajectory deletion tests
 def test_delete_existing_trajectory(client: TestClient):
     """Test deleting an existing trajectory."""
@@ -235,13 +529,7 @@ def test_delete_existing_trajectory(client: TestClient):
     trajectory_id = create_response.json()["id"]
 
     # Delete it
-    start_time = time.perf_counter()
     response = client.delete(f"/api/v1/trajectories/{trajectory_id}")
-    end_time = time.perf_counter()
-
-    # Check response time
-    response_time = end_time - start_time
-    assert response_time < 1.0, f"Response time {response_time:.3f}s exceeds 1s limit"
 
     assert response.status_code == 200
     data = response.json()
@@ -254,6 +542,42 @@ def test_delete_existing_trajectory(client: TestClient):
     assert get_response.status_code == 404
 
 
+def test_delete_during_get_does_not_cache_deleted_trajectory(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a DELETE racing a GET's database read keeps the deleted row out of the cache."""
+    payload = {"wall_width": 1.0, "wall_height": 1.0, "obstacles": []}
+    trajectory_id = client.post("/api/v1/trajectories", json=payload).json()["id"]
+    read_trajectory = TrajectoryRepository.get_trajectory
+
+    def read_then_delete(session: Session, trajectory_id: int):
+        trajectory = read_trajectory(session, trajectory_id)
+        # The DELETE completes after the GET has read the row but before it caches it
+        assert client.delete(f"/api/v1/trajectories/{trajectory_id}").status_code == 200
+        return trajectory
+
+    monkeypatch.setattr(TrajectoryRepository, "get_trajectory", read_then_delete)
+    assert client.get(f"/api/v1/trajectories/{trajectory_id}").status_code == 200
+    monkeypatch.undo()
+
+    assert client.get(f"/api/v1/trajectories/{trajectory_id}").status_code == 404
+
+
+def test_deleted_trajectory_ids_are_not_reused(client: TestClient):
+    """Test that a new trajectory never takes over the id of a deleted one."""
+    deleted_id = client.post(
+        "/api/v1/trajectories", json={"wall_width": 1.0, "wall_height": 1.0, "obstacles": []}
+    ).json()["id"]
+    assert client.delete(f"/api/v1/trajectories/{deleted_id}").status_code == 200
+
+    new_id = client.post(
+        "/api/v1/trajectories", json={"wall_width": 2.0, "wall_height": 2.0, "obstacles": []}
+    ).json()["id"]
+
+    assert new_id != deleted_id
+    assert client.get(f"/api/v1/trajectories/{deleted_id}").status_code == 404
+
+
 def test_delete_nonexistent_trajectory(client: TestClient):
     """Test deleting a non-existent trajectory."""
     response = client.delete("/api/v1/trajectories/99999")
@@ -269,7 +593,9 @@ def test_delete_trajectory_invalid_id(client: TestClient):
 
 # Performance tests
 @pytest.mark.parametrize("wall_width, wall_height", [(10.0, 10.0), (20.0, 20.0), (30.0, 30.0)])
-def test_large_wall_performance(client: TestClient, wall_width: float, wall_height: float):
+def test_large_wall_performance(
+    client: TestClient, benchmark: BenchmarkFixture, wall_width: float, wall_height: float
+):
     """Test performance with larger wall dimensions."""
     payload = {
         "wall_width": wall_width,
@@ -281,18 +607,22 @@ def test_large_wall_performance(client: TestClient, wall_width: float, wall_heig
         ],
     }
 
-    start_time = time.perf_counter()
-    response = client.post("/api/v1/trajectories", json=payload)
-    end_time = time.perf_counter()
-
-    response_time = end_time - start_time
-    assert response_time < 1.0, f"Large wall response time {response_time:.3f}s exceeds 1s limit"
+    # Clear cached plans before every round so each one generates the trajectory
+    response = benchmark.pedantic(
+        client.post,
+        args=("/api/v1/trajectories",),
+        kwargs={"json": payload},
+        setup=trajectories_api.plan_cache.clear,
+        rounds=10,
+        warmup_rounds=1,
+    )
 
     assert response.status_code == 201
     data = response.json()
     assert data["metadata"]["total_cells"] == int(wall_width / 0.1) * int(
         wall_height / 0.1
     )  # Exact calculation of the cells
+    # Timings are compared against a saved baseline (see README), not a fixed wall-clock limit
 
 
 # End-to-end workflow test
@@ -344,6 +674,31 @@ def test_complete_workflow(client: TestClient):
     assert final_get_response.status_code == 404
 
 
+# Static asset and compression tests
+def test_static_assets_are_cacheable(client: TestClient):
+    """Test that frontend assets carry cache headers and support revalidation."""
+    response = client.get("/static/index.html")
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    revalidation = client.get(
+        "/static/index.html", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidation.status_code == 304
+
+
+def test_large_responses_are_compressed(client: TestClient):
+    """Test that trajectory responses above the size threshold are gzip-compressed."""
+    payload = {"wall_width": 5.0, "wall_height": 5.0, "obstacles": []}
+
+    response = client.post(
+        "/api/v1/trajectories", json=payload, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 201
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["path"]) == 2500
+
+
 # Edge case tests
 def test_minimum_wall_size(client: TestClient):
     """Test with minimum wall size."""
@@ -359,3 +714,24 @@ def test_minimum_wall_size(client: TestClient):
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+def test_create_db_and_tables_tolerates_a_concurrent_creator(
+    engine, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that schema creation retries when another worker creates a table first."""
+    create_all = SQLModel.metadata.create_all
+    calls = []
+
+    def create_all_after_another_worker(bind, **kwargs):
+        calls.append(bind)
+        if len(calls) == 1:
+            raise OperationalError("CREATE TABLE trajectories", {}, Exception("already exists"))
+        create_all(bind, **kwargs)
+
+    monkeypatch.setattr(trajectory_models, "get_engine", lambda: engine)
+    monkeypatch.setattr(SQLModel.metadata, "create_all", create_all_after_another_worker)
+
+    trajectory_models.create_db_and_tables()
+
+    assert calls == [engine, engine]
@@ -0,0 +1,55 @@
+"""Tests for the in-process LRU cache."""
+
+from src.services.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that a full cache evicts the entry that was used longest ago."""
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_lru_cache_bounded_by_value_size():
+    """Test that `sizeof` bounds the total size of the values instead of the entry count."""
+    cache: LRUCache[str, bytes] = LRUCache(10, sizeof=len)
+    cache.set("a", b"1234")
+    cache.set("b", b"123456")
+    assert cache.size == 10
+
+    cache.set("c", b"12")
+    assert cache.get("a") is None
+    assert cache.size == 8
+
+    # Replacing an entry releases its old size, and oversized values are not cached at all
+    cache.set("b", b"1")
+    cache.set("d", b"12345678901")
+    assert cache.size == 3
+    assert cache.get("d") is None
+
+
+def test_lru_cache_counts_zero_size_values():
+    """Test that values reported as zero-size still count, so they cannot grow the cache forever."""
+    cache: LRUCache[int, bytes] = LRUCache(10, sizeof=len)
+    for key in range(1000):
+        cache.set(key, b"")
+
+    assert len(cache) == 10
+    assert cache.size == 10
+
+
+def test_lru_cache_skips_values_loaded_before_an_invalidation():
+    """Test that a value read before a `pop` is not stored by a `set` for that generation."""
+    cache: LRUCache[str, int] = LRUCache(2)
+    generation = cache.generation
+    cache.pop("a")
+
+    cache.set("a", 1, generation=generation)
+    assert cache.get("a") is None
+
+    cache.set("a", 1, generation=cache.generation)
+    assert cache.get("a") == 1
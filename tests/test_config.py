@@ -0,0 +1,32 @@
+"""Tests for configuration loading."""
+
+from src.config.loader import ConfigLoader, get_settings
+
+
+def test_merge_configs_nested_override():
+    """Test that overrides replace leaf values and keep untouched nested keys."""
+    base = {"debug": False, "database": {"url": "sqlite://", "echo": False}, "api": {"t": "a"}}
+    override = {"debug": True, "database": {"echo": True}, "cors": {"allow_origins": ["x"]}}
+
+    merged = ConfigLoader().merge_configs(base, override)
+
+    assert merged == {
+        "debug": True,
+        "database": {"url": "sqlite://", "echo": True},
+        "api": {"t": "a"},
+        "cors": {"allow_origins": ["x"]},
+    }
+
+
+def test_merge_configs_does_not_mutate_base():
+    """Test that merging leaves the base configuration untouched."""
+    base = {"database": {"url": "sqlite://", "echo": False}}
+
+    ConfigLoader().merge_configs(base, {"database": {"echo": True}})
+
+    assert base == {"database": {"url": "sqlite://", "echo": False}}
+
+
+def test_get_settings_is_cached():
+    """Test that settings are loaded once and reused."""
+    assert get_settings() is get_settings()
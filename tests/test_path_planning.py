@@ -0,0 +1,133 @@
+"""Tests for the path planning service."""
+
+import numpy as np
+import pytest
+
+from src.services import path_planning
+from src.services.path_planning import (
+    create_grid,
+    flatten_path,
+    generate_path,
+    generate_trajectory,
+    mark_obstacles,
+)
+
+
+def reference_path(grid: np.ndarray) -> list[list[int]]:
+    """Zigzag order spelled out cell by cell."""
+    rows, cols = grid.shape
+    path = []
+    for row in range(rows):
+        col_order = range(cols) if row % 2 == 0 else range(cols - 1, -1, -1)
+        path.extend([row, col] for col in col_order if not grid[row, col])
+    return path
+
+
+@pytest.fixture(params=["kernel", "fallback"])
+def planner_mode(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test against the compiled kernel (when numba is installed) and the fallback."""
+    if request.param == "fallback":
+        monkeypatch.setattr(path_planning, "_boustrophedon_kernel", None)
+    elif path_planning._boustrophedon_kernel is None:
+        pytest.skip("numba is not installed")
+    return str(request.param)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (2, 3), (7, 5), (40, 33)])
+def test_generate_path_matches_reference(planner_mode: str, shape: tuple[int, int]):
+    """Test that path generation visits every free cell in zigzag order."""
+    rng = np.random.default_rng(42)
+    grid = rng.random(shape) < 0.3
+
+    assert generate_path(grid).tolist() == reference_path(grid)
+
+
+def test_generate_path_returns_int16_pairs(planner_mode: str):
+    """Test that the path is a compact (N, 2) int16 array."""
+    path = generate_path(np.zeros((3, 4), dtype=bool))
+
+    assert path.dtype == np.int16
+    assert path.shape == (12, 2)
+
+
+def test_generate_path_fully_blocked(planner_mode: str):
+    """Test that a grid without free cells yields an empty path."""
+    assert generate_path(np.ones((3, 4), dtype=bool)).shape == (0, 2)
+
+
+def test_generate_path_with_obstacles(planner_mode: str):
+    """Test path generation on a grid with marked obstacles."""
+    grid = create_grid(2.0, 1.0, 0.1)
+    mark_obstacles(grid, [{"x": 0.5, "y": 0.2, "width": 0.3, "height": 0.4}], 0.1)
+
+    path = generate_path(grid)
+
+    assert path.tolist() == reference_path(grid)
+    assert all(not grid[row, col] for row, col in path)
+
+
+def test_boustrophedon_indices_source_matches_reference():
+    """Test the kernel source in plain Python, so CI covers it without numba installed."""
+    rng = np.random.default_rng(7)
+    grid = rng.random((9, 6)) < 0.4
+
+    assert path_planning._boustrophedon_indices(grid).tolist() == reference_path(grid)
+
+
+def test_mark_obstacles_matches_per_obstacle_bounds():
+    """Test that obstacles mark the cells from their start to their (inclusive) end cell."""
+    obstacles = [
+        {"x": 0.0, "y": 0.0, "width": 0.25, "height": 0.1},
+        {"x": 1.5, "y": 0.55, "width": 0.5, "height": 0.45},
+        {"x": 0.72, "y": 0.31, "width": 0.05, "height": 0.05},
+        {"x": 0.3, "y": 0.7, "width": 0.1, "height": 0.1},
+    ]
+    grid = create_grid(2.0, 1.0, 0.1)
+    mark_obstacles(grid, obstacles, 0.1)
+
+    expected = np.zeros_like(grid)
+    expected[0:2, 0:3] = True
+    # Ends on the far edges of the wall, so it is clipped to the grid
+    expected[5:10, 15:20] = True
+    expected[3, 7] = True
+    # Bounds are truncated after dividing by the cell size: 0.3 / 0.1 is 2.999..., 0.7 / 0.1 is
+    # 6.999..., and 0.7 + 0.1 is 0.7999..., so this obstacle covers cols 2-4 and rows 6-7
+    expected[6:8, 2:5] = True
+
+    np.testing.assert_array_equal(grid, expected)
+
+
+def test_mark_obstacles_without_obstacles():
+    """Test that an empty obstacle list leaves the grid free."""
+    grid = create_grid(1.0, 1.0, 0.1)
+    mark_obstacles(grid, [], 0.1)
+
+    assert not grid.any()
+
+
+def test_flatten_path_round_trips():
+    """Test that flat cell indices decode back to the [row, col] pairs."""
+    grid = create_grid(0.7, 0.4, 0.1)
+    path = generate_path(grid)
+
+    flat_path = flatten_path(path, grid.shape[1])
+
+    assert flat_path.dtype == np.int32
+    assert [list(divmod(int(index), grid.shape[1])) for index in flat_path] == path.tolist()
+
+
+def test_generate_trajectory_validates_by_default():
+    """Test that library callers get obstacle bounds checked."""
+    obstacles = [{"x": 0.8, "y": 0.0, "width": 0.5, "height": 0.5}]
+
+    with pytest.raises(ValueError, match="outside wall boundaries"):
+        generate_trajectory(1.0, 1.0, obstacles)
+
+
+def test_generate_trajectory_skips_validation_when_asked():
+    """Test that pre-validated inputs skip the per-obstacle checks."""
+    obstacles = [{"x": 0.8, "y": 0.0, "width": 0.5, "height": 0.5}]
+
+    path, metadata = generate_trajectory(1.0, 1.0, obstacles, validate=False)
+
+    assert metadata["path_points"] == len(path)
@@ -0,0 +1,68 @@
+"""Tests for the path planning process pool."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.config.loader import get_settings
+from src.config.schemas import LoggingConfig, PlannerConfig, ServerConfig
+from src.services import planner_pool
+from src.services.path_planning import generate_trajectory
+
+
+@pytest.mark.parametrize(
+    ("workers", "max_workers", "expected"), [(1, None, 8), (3, None, 2), (16, None, 0), (4, 3, 3)]
+)
+def test_planner_pool_size_shares_cpus_between_workers(
+    monkeypatch: pytest.MonkeyPatch, workers: int, max_workers: int | None, expected: int
+):
+    """Test that each API worker's pool defaults to its share of the CPUs."""
+    settings = get_settings().model_copy(
+        update={
+            "server": ServerConfig(reload=False, workers=workers),
+            "planner": PlannerConfig(max_workers=max_workers),
+        }
+    )
+    monkeypatch.setattr(planner_pool, "get_settings", lambda: settings)
+    monkeypatch.setattr(planner_pool.os, "cpu_count", lambda: 8)
+
+    assert planner_pool.planner_pool_size() == expected
+
+
+def test_planner_start_method_falls_back_to_spawn(monkeypatch: pytest.MonkeyPatch):
+    """Test that platforms without forkserver, such as Windows, start workers with spawn."""
+    assert planner_pool.planner_start_method() in ("forkserver", "spawn")
+
+    monkeypatch.setattr(planner_pool.multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+
+    assert planner_pool.planner_start_method() == "spawn"
+
+
+@pytest.mark.parametrize("level", ["INFO", "DEBUG"])
+def test_planner_processes_log_at_the_configured_level(tmp_path: Path, level: str):
+    """Test that planner processes write to the configured log file at the configured level."""
+    log_file = tmp_path / "planner.log"
+    settings = get_settings().model_copy(
+        update={
+            "debug": False,
+            "logging": LoggingConfig(
+                level=level, file_path=str(log_file), format="{level} | {function} | {message}"
+            ),
+        }
+    )
+    pool = ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context(planner_pool.planner_start_method()),
+        initializer=planner_pool.init_planner_process,
+        initargs=(settings,),
+    )
+    with pool:
+        pool.submit(generate_trajectory, 1.0, 1.0, []).result()
+
+    debug_lines = [line for line in log_file.read_text().splitlines() if line.startswith("DEBUG")]
+    if level == "INFO":
+        assert debug_lines == []
+    else:
+        assert any("create_grid" in line for line in debug_lines)